@@ -0,0 +1,14 @@
+"""JSON encoding shared by report and history code, using orjson when available."""
+
+from typing import Any
+
+try:
+    from orjson import dumps, loads
+except ImportError:
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes, like orjson.dumps."""
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    loads = json.loads
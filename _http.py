@@ -0,0 +1,29 @@
+"""Shared HTTP session for GitHub API calls."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _create_session() -> requests.Session:
+    """Create a requests session with retry policy and connection pooling for GitHub API."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "PUT", "POST"]
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.headers["Accept"] = "application/vnd.github.v3+json"
+    return session
+
+
+# Created once so every GitHub call reuses the same pooled keep-alive connections
+_SESSION = _create_session()
+
+
+def get_github_session() -> requests.Session:
+    """Return the shared requests session for GitHub API calls."""
+    return _SESSION
@@ -1,9 +1,386 @@
 """Dropbox folder scanning logic."""
 
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
+import aiohttp
 import dropbox
-from dropbox.files import FolderMetadata, FileMetadata
-from collections import deque
-from typing import List, Dict, Any, Optional
+from dropbox.files import FolderMetadata, FileMetadata, DeletedMetadata
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+MAX_WORKERS = 16  # folders listed concurrently per BFS level
+MAX_SDK_IN_FLIGHT = 32  # cap on concurrent Dropbox SDK requests across threads
+MAX_IN_FLIGHT = 64  # cap on concurrent Dropbox API requests in the async scanner
+MAX_RATE_LIMIT_RETRIES = 5
+API_URL = 'https://api.dropboxapi.com/2'
+TOKEN_URL = 'https://api.dropboxapi.com/oauth2/token'
+TIMEOUT = 30  # seconds
+
+_SEM = threading.BoundedSemaphore(MAX_SDK_IN_FLIGHT)
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4)  # fetches the next page of a cursor
+
+# Entry types compared by identity in the per-entry loops (the SDK never subclasses them)
+_FM = FileMetadata
+_FD = FolderMetadata
+_DM = DeletedMetadata
+
+
+def _call(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Call a Dropbox SDK method under the in-flight semaphore, retrying on rate limits.
+
+    Args:
+        method: Bound Dropbox client method (e.g., dbx.files_list_folder)
+        *args: Positional arguments for the method
+        **kwargs: Keyword arguments for the method
+
+    Returns:
+        The method's result
+
+    Raises:
+        dropbox.exceptions.RateLimitError: If still rate limited after all retries
+    """
+    attempt = 0
+    while True:
+        try:
+            with _SEM:
+                return method(*args, **kwargs)
+        except dropbox.exceptions.RateLimitError as e:
+            if attempt >= MAX_RATE_LIMIT_RETRIES:
+                raise
+            delay = e.backoff if e.backoff is not None else 2 ** attempt
+
+        # Sleep outside the semaphore so other requests can proceed
+        attempt += 1
+        time.sleep(delay)
+
+
+def _scan_one(dbx: dropbox.Dropbox, path: str) -> Tuple[str, int, List[str], Optional[str]]:
+    """
+    List a single folder, following pagination, and count its direct files.
+
+    Args:
+        dbx: Dropbox client (shared across worker threads)
+        path: Folder path to list
+
+    Returns:
+        Tuple of (path, file_count, subfolder_paths, error); error is None on success
+    """
+    file_count = 0
+    subfolders: List[str] = []
+
+    try:
+        result = _call(dbx.files_list_folder, path, limit=2000)
+        entries = result.entries
+
+        while result.has_more:
+            result = _call(dbx.files_list_folder_continue, result.cursor)
+            entries.extend(result.entries)
+
+        append = subfolders.append
+        for entry in entries:
+            cls = entry.__class__
+            if cls is _FM:
+                file_count += 1
+            elif cls is _FD:
+                append(entry.path_lower)
+
+    except dropbox.exceptions.ApiError as e:
+        return path, -1, [], str(e)
+
+    return path, file_count, subfolders, None
+
+
+def _sort_by_path(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort scan results case-insensitively by path, lowercasing each path once."""
+    decorated = [(result['path'].lower(), result) for result in results]
+    decorated.sort(key=itemgetter(0))
+    return [result for _, result in decorated]
+
+
+def _drop_subtrees(prefixes: Tuple[str, ...], folders: Set[str], files: Set[str]) -> None:
+    """Remove every folder and file under the given 'path/' prefixes in one pass."""
+    folders.difference_update([f for f in folders if f.startswith(prefixes)])
+    files.difference_update([f for f in files if f.startswith(prefixes)])
+
+
+def _apply_entries(entries: List[Any], folders: Set[str], files: Set[str]) -> None:
+    """
+    Apply list_folder entries (additions, changes and deletions) to a tree snapshot.
+
+    Dropping a deleted folder's contents means a pass over the whole snapshot,
+    so the subtrees deleted in a page are collected and dropped together:
+    one pass per page rather than one per deleted folder. The pending drop is
+    done early only if a later entry re-creates something under a deleted folder.
+
+    Args:
+        entries: Metadata entries from a list_folder page
+        folders: Lowercased folder paths, updated in place
+        files: Lowercased file paths, updated in place
+    """
+    # 'path/' prefixes of deleted folders whose contents are still to be dropped
+    pending: Tuple[str, ...] = ()
+    for entry in entries:
+        cls = entry.__class__
+        path = entry.path_lower
+        if cls is _DM:
+            if path in files:
+                files.discard(path)
+            elif path in folders:
+                # A deleted folder takes everything beneath it along
+                folders.discard(path)
+                pending += (path + '/',)
+            continue
+
+        if pending and path.startswith(pending):
+            _drop_subtrees(pending, folders, files)
+            pending = ()
+        if cls is _FM:
+            files.add(path)
+        elif cls is _FD:
+            folders.add(path)
+
+    if pending:
+        _drop_subtrees(pending, folders, files)
+
+
+def _count_entries(entries: List[Any], counts: Dict[str, int]) -> None:
+    """
+    Add list_folder entries to direct file counts keyed by lowercased folder path.
+
+    Only valid for a fresh listing, which contains no deletions.
+    """
+    get = counts.get
+    for entry in entries:
+        cls = entry.__class__
+        if cls is _FM:
+            parent = entry.path_lower.rsplit('/', 1)[0]
+            counts[parent] = get(parent, 0) + 1
+        elif cls is _FD:
+            counts.setdefault(entry.path_lower, 0)
+
+
+def _follow_cursor(dbx: dropbox.Dropbox, result: Any, apply: Callable[[List[Any]], None]) -> str:
+    """
+    Pass a list_folder result and all of its continuation pages to apply.
+
+    Each continuation is requested before the current page is processed, so
+    fetching the next page overlaps with applying this one.
+
+    Returns:
+        Cursor from the final page, usable to fetch later changes
+    """
+    while True:
+        next_page = None
+        if result.has_more:
+            next_page = _PREFETCH_POOL.submit(_call, dbx.files_list_folder_continue, result.cursor)
+
+        apply(result.entries)
+
+        if next_page is None:
+            return result.cursor
+        result = next_page.result()
+
+
+def _counts_to_results(root_path: str, counts: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Turn direct file counts keyed by lowercased folder path into sorted scan results."""
+    root_lower = root_path.lower()
+    counts.setdefault(root_lower, 0)
+
+    # Keys are already lowercase, so a plain sort gives the case-insensitive order
+    results: List[Dict[str, Any]] = []
+    for path in sorted(counts):
+        # Report the root as given by the caller, like the per-folder scan
+        display_path = root_path if path == root_lower else path
+        results.append({
+            'path': display_path if display_path else '/',
+            'file_count': counts[path]
+        })
+
+    return results
+
+
+def _scan_recursive(dbx: dropbox.Dropbox, root_path: str) -> List[Dict[str, Any]]:
+    """
+    Count direct files per folder from a recursive listing of root_path.
+
+    Only the per-folder counts are kept, not the individual file paths.
+
+    Args:
+        dbx: Dropbox client
+        root_path: Normalized root folder path ("" for root)
+
+    Returns:
+        List of dictionaries with 'path' and 'file_count' keys
+
+    Raises:
+        dropbox.exceptions.ApiError: If the recursive listing fails
+    """
+    counts: Dict[str, int] = {}
+    result = _call(dbx.files_list_folder, root_path, recursive=True, limit=2000)
+    _follow_cursor(dbx, result, lambda entries: _count_entries(entries, counts))
+    return _counts_to_results(root_path, counts)
+
+
+def _scan_incremental(
+    dbx: dropbox.Dropbox,
+    root_path: str,
+    cached: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Like _scan_recursive, but keeps a tree snapshot so later scans fetch only changes.
+
+    With a cached snapshot, only the changes since its cursor are fetched.
+    If Dropbox rejects the saved cursor (e.g. a reset), a full listing is done.
+    Deletions name a path without saying whether it was a file or a folder,
+    so the snapshot holds every folder and file path.
+
+    Args:
+        dbx: Dropbox client
+        root_path: Normalized root folder path ("" for root)
+        cached: Snapshot from a previous scan ('cursor', 'folders', 'files')
+
+    Returns:
+        Tuple of (results, snapshot to cache for the next scan)
+
+    Raises:
+        dropbox.exceptions.ApiError: If the full recursive listing fails
+    """
+    cursor = None
+
+    if cached:
+        folders = set(cached['folders'])
+        files = set(cached['files'])
+        try:
+            result = _call(dbx.files_list_folder_continue, cached['cursor'])
+            cursor = _follow_cursor(dbx, result, lambda entries: _apply_entries(entries, folders, files))
+            print("Applied Dropbox changes since the previous scan")
+        except dropbox.exceptions.ApiError as e:
+            print(f"Saved cursor rejected ({e}), running a full scan")
+
+    if cursor is None:
+        folders = set()
+        files = set()
+        result = _call(dbx.files_list_folder, root_path, recursive=True, limit=2000)
+        cursor = _follow_cursor(dbx, result, lambda entries: _apply_entries(entries, folders, files))
+
+    counts: Dict[str, int] = dict.fromkeys(folders, 0)
+    for path in files:
+        parent = path.rsplit('/', 1)[0]
+        counts[parent] = counts.get(parent, 0) + 1
+
+    snapshot = {
+        'cursor': cursor,
+        'folders': list(folders),
+        'files': list(files)
+    }
+    return _counts_to_results(root_path, counts), snapshot
+
+
+def _load_cursor_cache(cache_path: str) -> Dict[str, Any]:
+    """Load saved scan snapshots keyed by lowercased root path."""
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not read cursor cache {cache_path}: {e}")
+        return {}
+
+
+def _save_cursor_cache(cache_path: str, cache: Dict[str, Any]) -> None:
+    """Write scan snapshots back to disk; failures only cost a full scan next time."""
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, separators=(',', ':'))
+    except OSError as e:
+        print(f"Warning: Could not write cursor cache {cache_path}: {e}")
+
+
+def _scan_parallel(dbx: dropbox.Dropbox, root_path: str, max_workers: int) -> List[Dict[str, Any]]:
+    """
+    Scan root_path folder by folder, listing each BFS level concurrently.
+
+    Every folder in the current frontier is listed in a worker thread, and the
+    subfolders they return form the next frontier. Folders that fail to list
+    are recorded with a file_count of -1.
+
+    Args:
+        dbx: Dropbox client (shared across worker threads)
+        root_path: Normalized root folder path ("" for root)
+        max_workers: Number of folders to list concurrently
+
+    Returns:
+        List of dictionaries with 'path' and 'file_count' keys
+    """
+    results: List[Dict[str, Any]] = []
+
+    # Folders to list at the current BFS level
+    frontier = [root_path]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while frontier:
+            futures = [executor.submit(_scan_one, dbx, path) for path in frontier]
+            next_frontier: List[str] = []
+
+            # Results are collected on this thread, so no locking is needed
+            for future in as_completed(futures):
+                current_path, file_count, subfolders, error = future.result()
+                display_path = current_path if current_path else '/'
+
+                if error is None:
+                    results.append({
+                        'path': display_path,
+                        'file_count': file_count
+                    })
+                    next_frontier.extend(subfolders)
+                else:
+                    print(f"Error scanning {current_path}: {error}")
+                    # Still record the folder with -1 to indicate error
+                    results.append({
+                        'path': display_path,
+                        'file_count': -1,
+                        'error': error
+                    })
+
+            frontier = next_frontier
+
+    return _sort_by_path(results)
+
+
+@lru_cache(maxsize=1)
+def _get_client(
+    access_token: str,
+    refresh_token: Optional[str],
+    app_key: Optional[str],
+    app_secret: Optional[str],
+    max_connections: int
+) -> dropbox.Dropbox:
+    """
+    Create a Dropbox client, reused across calls with the same credentials.
+
+    Warm Cloud Function instances keep the client, so its refreshed access
+    token and pooled connections carry over to the next invocation.
+    """
+    # Size the connection pool to the worker count so connections are reused
+    session = dropbox.create_session(max_connections=max_connections)
+    # Rate limits are retried by _call, which waits outside the semaphore
+    if refresh_token and app_key:
+        return dropbox.Dropbox(
+            oauth2_access_token=access_token,
+            oauth2_refresh_token=refresh_token,
+            app_key=app_key,
+            app_secret=app_secret,
+            session=session,
+            max_retries_on_rate_limit=0
+        )
+    return dropbox.Dropbox(access_token, session=session, max_retries_on_rate_limit=0)
 
 
 def scan_dropbox_folder(
@@ -11,30 +388,194 @@ def scan_dropbox_folder(
     root_path: str,
     refresh_token: Optional[str] = None,
     app_key: Optional[str] = None,
-    app_secret: Optional[str] = None
+    app_secret: Optional[str] = None,
+    max_workers: int = MAX_WORKERS,
+    use_async: bool = False,
+    cursor_cache: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Recursively scan a Dropbox folder and count direct files in each subfolder.
 
+    The whole tree is read with one recursive list_folder cursor. If that
+    listing fails, the scan falls back to listing folders one by one in
+    parallel, so a single unreadable folder only marks that folder as an error.
+
+    When cursor_cache is given, the tree snapshot and its cursor are saved
+    there, and later scans of the same root only fetch what changed.
+
     Args:
         access_token: Dropbox API access token
         root_path: Root folder path to scan (e.g., "/MyFolder" or "" for root)
         refresh_token: OAuth2 refresh token for automatic token refresh
         app_key: Dropbox app key (required with refresh_token)
         app_secret: Dropbox app secret (optional, for confidential apps)
+        max_workers: Number of folders to list concurrently in the fallback scan
+        use_async: Use the asyncio/aiohttp scanner instead of worker threads
+        cursor_cache: Path of a JSON file for reusing the cursor across runs
 
     Returns:
         List of dictionaries with 'path' and 'file_count' keys
     """
-    if refresh_token and app_key:
-        dbx = dropbox.Dropbox(
-            oauth2_access_token=access_token,
-            oauth2_refresh_token=refresh_token,
+    if use_async:
+        return asyncio.run(scan_dropbox_folder_async(
+            access_token,
+            root_path,
+            refresh_token=refresh_token,
             app_key=app_key,
             app_secret=app_secret
+        ))
+
+    dbx = _get_client(access_token, refresh_token, app_key, app_secret, max_workers)
+
+    # Normalize root path (empty string for root, otherwise ensure leading slash)
+    if root_path and not root_path.startswith('/'):
+        root_path = '/' + root_path
+    if root_path == '/':
+        root_path = ''
+
+    cache = _load_cursor_cache(cursor_cache) if cursor_cache else {}
+    cache_key = root_path.lower()
+
+    try:
+        try:
+            if cursor_cache:
+                results, snapshot = _scan_incremental(dbx, root_path, cache.get(cache_key))
+                cache[cache_key] = snapshot
+                _save_cursor_cache(cursor_cache, cache)
+            else:
+                results = _scan_recursive(dbx, root_path)
+        except dropbox.exceptions.ApiError as e:
+            print(f"Recursive listing failed ({e}), scanning folder by folder")
+            results = _scan_parallel(dbx, root_path, max_workers)
+    except dropbox.exceptions.AuthError:
+        # Drop the cached client (from either scan path) so the next call
+        # authenticates from scratch
+        _get_client.cache_clear()
+        raise
+
+    # Both scan paths return results sorted by path for consistent output
+    return results
+
+
+async def _rpc(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    endpoint: str,
+    body: Dict[str, Any]
+) -> Tuple[int, Any]:
+    """
+    POST to a Dropbox RPC endpoint, backing off on 429 responses.
+
+    Args:
+        session: Authorized aiohttp session
+        sem: Semaphore limiting concurrent requests
+        endpoint: Endpoint path relative to API_URL (e.g., "files/list_folder")
+        body: JSON request body
+
+    Returns:
+        Tuple of (status_code, parsed JSON on success or error summary otherwise)
+    """
+    attempt = 0
+    while True:
+        async with sem:
+            async with session.post(f"{API_URL}/{endpoint}", json=body) as response:
+                if response.status == 200:
+                    return 200, await response.json()
+                if response.status == 409:
+                    error = await response.json(content_type=None)
+                    return 409, error.get('error_summary', str(error))
+                if response.status != 429 or attempt >= MAX_RATE_LIMIT_RETRIES:
+                    return response.status, await response.text()
+                delay = float(response.headers.get('Retry-After', 2 ** attempt))
+
+        # Sleep outside the semaphore so other requests can proceed
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+async def _list_folder(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    path: str
+) -> Tuple[str, int, List[str], Optional[str]]:
+    """
+    List a single folder, following pagination, and count its direct files.
+
+    Returns:
+        Tuple of (path, file_count, subfolder_paths, error); error is None on success
+    """
+    file_count = 0
+    subfolders: List[str] = []
+
+    status, result = await _rpc(session, sem, 'files/list_folder', {'path': path, 'limit': 2000})
+    while True:
+        if status == 409:
+            return path, -1, [], result
+        if status != 200:
+            raise Exception(f"Dropbox API error: {status} - {result}")
+
+        for entry in result['entries']:
+            tag = entry['.tag']
+            if tag == 'file':
+                file_count += 1
+            elif tag == 'folder':
+                subfolders.append(entry['path_lower'])
+
+        if not result['has_more']:
+            return path, file_count, subfolders, None
+
+        # Continuation takes only the cursor; resending the path is rejected
+        status, result = await _rpc(
+            session, sem, 'files/list_folder/continue', {'cursor': result['cursor']}
         )
-    else:
-        dbx = dropbox.Dropbox(access_token)
+
+
+async def _refresh_access_token(
+    session: aiohttp.ClientSession,
+    refresh_token: str,
+    app_key: str,
+    app_secret: Optional[str] = None
+) -> str:
+    """Exchange a refresh token for a short-lived access token."""
+    data = {
+        'grant_type': 'refresh_token',
+        'refresh_token': refresh_token,
+        'client_id': app_key
+    }
+    if app_secret:
+        data['client_secret'] = app_secret
+
+    async with session.post(TOKEN_URL, data=data) as response:
+        if response.status != 200:
+            raise Exception(f"Dropbox token refresh error: {response.status} - {await response.text()}")
+        return (await response.json())['access_token']
+
+
+async def scan_dropbox_folder_async(
+    access_token: str,
+    root_path: str,
+    refresh_token: Optional[str] = None,
+    app_key: Optional[str] = None,
+    app_secret: Optional[str] = None,
+    max_in_flight: int = MAX_IN_FLIGHT
+) -> List[Dict[str, Any]]:
+    """
+    Scan a Dropbox folder like scan_dropbox_folder, using asyncio and aiohttp.
+
+    Calls the Dropbox HTTP API directly so a single thread can keep many
+    list_folder requests in flight. Each BFS level is listed with asyncio.gather.
+
+    Args:
+        access_token: Dropbox API access token
+        root_path: Root folder path to scan (e.g., "/MyFolder" or "" for root)
+        refresh_token: OAuth2 refresh token for automatic token refresh
+        app_key: Dropbox app key (required with refresh_token)
+        app_secret: Dropbox app secret (optional, for confidential apps)
+        max_in_flight: Maximum number of concurrent API requests
+
+    Returns:
+        List of dictionaries with 'path' and 'file_count' keys
+    """
     results: List[Dict[str, Any]] = []
 
     # Normalize root path (empty string for root, otherwise ensure leading slash)
@@ -43,48 +584,40 @@ def scan_dropbox_folder(
     if root_path == '/':
         root_path = ''
 
-    # Queue of folders to process
-    folders_to_scan = deque([root_path])
+    connector = aiohttp.TCPConnector(limit=max_in_flight, limit_per_host=max_in_flight)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
 
-    while folders_to_scan:
-        current_path = folders_to_scan.popleft()
-        file_count = 0
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        if refresh_token and app_key:
+            access_token = await _refresh_access_token(session, refresh_token, app_key, app_secret)
+        session.headers['Authorization'] = f"Bearer {access_token}"
 
-        try:
-            # List folder contents with pagination
-            result = dbx.files_list_folder(current_path)
-            entries = result.entries
-
-            while result.has_more:
-                result = dbx.files_list_folder_continue(result.cursor)
-                entries.extend(result.entries)
-
-            # Process entries
-            for entry in entries:
-                if isinstance(entry, FileMetadata):
-                    file_count += 1
-                elif isinstance(entry, FolderMetadata):
-                    # Add subfolder to scan queue
-                    folders_to_scan.append(entry.path_lower)
-
-            # Record this folder's direct file count
-            display_path = current_path if current_path else '/'
-            results.append({
-                'path': display_path,
-                'file_count': file_count
-            })
+        sem = asyncio.Semaphore(max_in_flight)
+        frontier = [root_path]
 
-        except dropbox.exceptions.ApiError as e:
-            print(f"Error scanning {current_path}: {e}")
-            # Still record the folder with -1 to indicate error
-            display_path = current_path if current_path else '/'
-            results.append({
-                'path': display_path,
-                'file_count': -1,
-                'error': str(e)
-            })
+        while frontier:
+            listings = await asyncio.gather(*[_list_folder(session, sem, p) for p in frontier])
+            next_frontier: List[str] = []
 
-    # Sort results by path for consistent output
-    results.sort(key=lambda x: x['path'].lower())
+            for current_path, file_count, subfolders, error in listings:
+                display_path = current_path if current_path else '/'
 
-    return results
+                if error is None:
+                    results.append({
+                        'path': display_path,
+                        'file_count': file_count
+                    })
+                    next_frontier.extend(subfolders)
+                else:
+                    print(f"Error scanning {current_path}: {error}")
+                    # Still record the folder with -1 to indicate error
+                    results.append({
+                        'path': display_path,
+                        'file_count': -1,
+                        'error': error
+                    })
+
+            frontier = next_frontier
+
+    # Sort results by path for consistent output
+    return _sort_by_path(results)
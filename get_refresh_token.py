@@ -2,7 +2,6 @@
 
 import os
 import requests
-import base64
 import webbrowser
 from dotenv import load_dotenv
 
@@ -35,15 +34,15 @@ auth_code = input("\n   Paste the authorization code here: ").strip()
 print("\n3. Exchanging code for tokens...")
 
 token_url = "https://api.dropboxapi.com/oauth2/token"
-auth_header = base64.b64encode(f"{APP_KEY}:{APP_SECRET}".encode()).decode()
 
 response = requests.post(
     token_url,
-    headers={"Authorization": f"Basic {auth_header}"},
+    auth=(APP_KEY, APP_SECRET),
     data={
         "code": auth_code,
         "grant_type": "authorization_code"
-    }
+    },
+    timeout=30
 )
 
 if response.status_code == 200:
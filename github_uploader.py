@@ -1,113 +1,151 @@
 """GitHub Pages upload logic for hosting HTML reports."""
 
 import base64
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from typing import Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import _fastjson
+from _http import get_github_session
 
 
 REPORT_FILENAME = 'index.html'  # index.html for GitHub Pages root
 TIMEOUT = 30  # seconds
 
 
-def get_github_session() -> requests.Session:
-    """Create a requests session with retry policy for GitHub API."""
-    session = requests.Session()
-    retry = Retry(
-        total=3,
-        backoff_factor=0.5,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "PUT", "POST"]
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
-    return session
-
-
-def get_file_sha(token: str, owner: str, repo: str, path: str) -> Optional[str]:
+def get_pages_url(owner: str, repo: str, filename: str = REPORT_FILENAME) -> str:
     """
-    Get the SHA of an existing file (needed for updates).
+    Build the GitHub Pages URL for a file in the repository.
 
     Args:
-        token: GitHub Personal Access Token
-        owner: Repository owner
+        owner: Repository owner (username or org)
         repo: Repository name
-        path: File path in repo
+        filename: File path in repo
 
     Returns:
-        File SHA if exists, None otherwise
+        Public GitHub Pages URL
     """
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-
-    response = get_github_session().get(url, headers=headers, timeout=TIMEOUT)
-
-    if response.status_code == 200:
-        return response.json().get('sha')
-    return None
+    # Format: https://<owner>.github.io/<repo>/ for index.html
+    # Format: https://<owner>.github.io/<repo>/<filename> for other files
+    if filename == "index.html":
+        return f"https://{owner}.github.io/{repo}/"
+    return f"https://{owner}.github.io/{repo}/{filename}"
 
 
-def upload_html_to_github(
+def commit_files(
     token: str,
     owner: str,
     repo: str,
-    html_content: str,
-    filename: str = REPORT_FILENAME,
-    branch: str = "master"
-) -> Tuple[str, str]:
+    files: Dict[str, bytes],
+    branch: str = "master",
+    message: str = "Update Dropbox folder report"
+) -> str:
     """
-    Upload HTML content to GitHub repository.
+    Commit several files to a branch as a single commit via the Git Data API.
+
+    The branch head is read while the blobs are created concurrently, then a
+    tree on top of the head, a commit, and a fast-forward of the branch ref.
+    If the branch does not exist yet, the commit has no parent and the branch
+    is created pointing at it.
 
     Args:
         token: GitHub Personal Access Token
-        owner: Repository owner (username or org)
+        owner: Repository owner
         repo: Repository name
-        html_content: HTML content to upload
-        filename: Name for the file (default: index.html)
-        branch: Branch to upload to
+        files: Mapping of file path in repo to file content
+        branch: Branch to commit to
+        message: Commit message
 
     Returns:
-        Tuple of (filename, github_pages_url)
+        SHA of the new commit
     """
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents/{filename}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-
-    # Encode content as base64
-    content_b64 = base64.b64encode(html_content.encode('utf-8')).decode('utf-8')
-
-    # Check if file exists (need SHA for update)
-    existing_sha = get_file_sha(token, owner, repo, filename)
+    api_url = f"https://api.github.com/repos/{owner}/{repo}/git"
+    headers = {"Authorization": f"token {token}"}
+    session = get_github_session()
+
+    def get_branch_head() -> Optional[Tuple[str, str]]:
+        # The branches endpoint returns the head commit and its tree SHA together
+        r = session.get(
+            f"https://api.github.com/repos/{owner}/{repo}/branches/{branch}",
+            headers=headers,
+            timeout=TIMEOUT
+        )
+        if r.status_code == 404:
+            return None
+        if r.status_code != 200:
+            raise Exception(f"GitHub API error reading {branch}: {r.status_code} - {r.text}")
+        commit = r.json()['commit']
+        return commit['sha'], commit['commit']['tree']['sha']
+
+    def create_blob(content: bytes) -> str:
+        # Send text as UTF-8 (base64 would inflate the upload by a third);
+        # only content that isn't valid UTF-8 falls back to base64
+        try:
+            body = _fastjson.dumps({"encoding": "utf-8", "content": content.decode('utf-8')})
+        except UnicodeDecodeError:
+            body = b'{"encoding":"base64","content":"' + base64.b64encode(content) + b'"}'
+        r = session.post(
+            f"{api_url}/blobs",
+            headers={**headers, "Content-Type": "application/json"},
+            data=body,
+            timeout=TIMEOUT
+        )
+        if r.status_code != 201:
+            raise Exception(f"GitHub API error creating blob: {r.status_code} - {r.text}")
+        return r.json()['sha']
+
+    # Blobs do not depend on the branch head, so all of these run at once
+    with ThreadPoolExecutor(max_workers=len(files) + 1) as executor:
+        head_future = executor.submit(get_branch_head)
+        blob_futures = {path: executor.submit(create_blob, content) for path, content in files.items()}
+        head = head_future.result()
+        blob_shas = {path: future.result() for path, future in blob_futures.items()}
+
+    # A missing branch (head is None) gets a root commit with no base tree
+    base_sha, base_tree = head or (None, None)
 
     data = {
-        "message": "Update Dropbox folder report",
-        "content": content_b64,
-        "branch": branch
+        "tree": [
+            {"path": path, "mode": "100644", "type": "blob", "sha": sha}
+            for path, sha in blob_shas.items()
+        ]
     }
+    if base_tree:
+        data["base_tree"] = base_tree
+    response = session.post(f"{api_url}/trees", headers=headers, json=data, timeout=TIMEOUT)
+    if response.status_code != 201:
+        raise Exception(f"GitHub API error creating tree: {response.status_code} - {response.text}")
+    tree_sha = response.json()['sha']
 
-    if existing_sha:
-        data["sha"] = existing_sha
-
-    response = get_github_session().put(url, headers=headers, json=data, timeout=TIMEOUT)
-
-    if response.status_code not in [200, 201]:
-        raise Exception(f"GitHub API error: {response.status_code} - {response.text}")
-
-    # Generate GitHub Pages URL
-    # Format: https://<owner>.github.io/<repo>/ for index.html
-    # Format: https://<owner>.github.io/<repo>/<filename> for other files
-    if filename == "index.html":
-        pages_url = f"https://{owner}.github.io/{repo}/"
+    data = {
+        "message": message,
+        "tree": tree_sha,
+        "parents": [base_sha] if base_sha else []
+    }
+    response = session.post(f"{api_url}/commits", headers=headers, json=data, timeout=TIMEOUT)
+    if response.status_code != 201:
+        raise Exception(f"GitHub API error creating commit: {response.status_code} - {response.text}")
+    commit_sha = response.json()['sha']
+
+    if base_sha:
+        # Fast-forward only; fails if the branch moved since it was read
+        response = session.patch(
+            f"{api_url}/refs/heads/{branch}",
+            headers=headers,
+            json={"sha": commit_sha},
+            timeout=TIMEOUT
+        )
     else:
-        pages_url = f"https://{owner}.github.io/{repo}/{filename}"
+        # First commit on the branch; fails if it was created since it was read
+        response = session.post(
+            f"{api_url}/refs",
+            headers=headers,
+            json={"ref": f"refs/heads/{branch}", "sha": commit_sha},
+            timeout=TIMEOUT
+        )
+    if response.status_code not in [200, 201]:
+        raise Exception(f"GitHub API error updating {branch}: {response.status_code} - {response.text}")
 
-    return filename, pages_url
+    return commit_sha
 
 
 def check_pages_enabled(token: str, owner: str, repo: str) -> bool:
@@ -123,16 +161,13 @@ def check_pages_enabled(token: str, owner: str, repo: str) -> bool:
         True if Pages is enabled
     """
     url = f"https://api.github.com/repos/{owner}/{repo}/pages"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    headers = {"Authorization": f"token {token}"}
 
     response = get_github_session().get(url, headers=headers, timeout=TIMEOUT)
     return response.status_code == 200
 
 
-def enable_pages(token: str, owner: str, repo: str, branch: str = "master") -> None:
+def enable_pages(token: str, owner: str, repo: str, branch: str = "master") -> bool:
     """
     Enable GitHub Pages for the repository.
 
@@ -141,12 +176,12 @@ def enable_pages(token: str, owner: str, repo: str, branch: str = "master") -> N
         owner: Repository owner
         repo: Repository name
         branch: Branch to serve from
+
+    Returns:
+        True if Pages is now enabled
     """
     url = f"https://api.github.com/repos/{owner}/{repo}/pages"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    headers = {"Authorization": f"token {token}"}
 
     data = {
         "source": {
@@ -159,3 +194,57 @@ def enable_pages(token: str, owner: str, repo: str, branch: str = "master") -> N
 
     if response.status_code not in [201, 409]:  # 409 = already enabled
         print(f"Warning: Could not enable Pages: {response.status_code} - {response.text}")
+        return False
+    return True
+
+
+def _pages_site_found(owner: str, repo: str) -> bool:
+    """
+    Check that the published Pages site answers, without using the GitHub API.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+
+    Returns:
+        False only if the site returns 404 (e.g. Pages was turned off)
+    """
+    response = get_github_session().head(get_pages_url(owner, repo), allow_redirects=True, timeout=TIMEOUT)
+    return response.status_code != 404
+
+
+def ensure_pages_enabled(
+    token: str,
+    owner: str,
+    repo: str,
+    branch: str = "master",
+    confirmed: Optional[str] = None
+) -> Optional[str]:
+    """
+    Make sure GitHub Pages is enabled, skipping the API check once it has been confirmed.
+
+    The caller keeps the returned record (main.py stores it in history.json)
+    and passes it back as confirmed on the next run. For a matching record,
+    only the public Pages URL is requested; if it returns 404 the record is
+    ignored and Pages is checked, and enabled if needed, through the API.
+
+    Args:
+        token: GitHub Personal Access Token
+        owner: Repository owner
+        repo: Repository name
+        branch: Branch to serve from
+        confirmed: Record returned by an earlier call, if any
+
+    Returns:
+        Record of the confirmed Pages target, or None if Pages could not be enabled
+    """
+    target = f"{owner}/{repo}@{branch}"
+    if confirmed == target and _pages_site_found(owner, repo):
+        return target
+
+    if not check_pages_enabled(token, owner, repo):
+        print("Enabling GitHub Pages...")
+        if not enable_pages(token, owner, repo, branch):
+            return None
+
+    return target
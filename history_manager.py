@@ -1,32 +1,17 @@
 """History management for tracking file count trends over time."""
 
-import json
-import base64
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from datetime import datetime, timedelta
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from typing import Dict, Optional
 
+import _fastjson
+from _http import get_github_session
+
 
 HISTORY_FILENAME = 'history.json'
 TIMEOUT = 30  # seconds
 
 
-def get_github_session() -> requests.Session:
-    """Create a requests session with retry policy for GitHub API."""
-    session = requests.Session()
-    retry = Retry(
-        total=3,
-        backoff_factor=0.5,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "PUT", "POST"]
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
-    return session
-
-
 def fetch_history_from_github(token: str, owner: str, repo: str) -> Dict:
     """
     Fetch existing history.json from GitHub repository.
@@ -40,58 +25,65 @@ def fetch_history_from_github(token: str, owner: str, repo: str) -> Dict:
         History dict with 'data' list, or empty structure if not found
     """
     url = f"https://api.github.com/repos/{owner}/{repo}/contents/{HISTORY_FILENAME}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    # The raw media type returns the file bytes directly, skipping the JSON
+    # envelope and base64 decode (and the 1 MB limit on inline content)
+    headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.raw+json"}
 
     response = get_github_session().get(url, headers=headers, timeout=TIMEOUT)
 
     if response.status_code == 200:
-        content_b64 = response.json().get('content', '')
-        content = base64.b64decode(content_b64).decode('utf-8')
         try:
-            return json.loads(content)
-        except json.JSONDecodeError:
+            return _fastjson.loads(response.content)
+        except ValueError:
             print("Warning: Could not parse history.json, starting fresh")
             return {"data": []}
-    else:
-        print(f"No existing history found (status {response.status_code}), starting fresh")
-        return {"data": []}
+
+    print(f"No existing history found (status {response.status_code}), starting fresh")
+    return {"data": []}
 
 
-def append_to_history(history: Dict, date: str, total_files: int, total_folders: int) -> Dict:
+def append_to_history(
+    history: Dict,
+    day: str,
+    total_files: int,
+    total_folders: int,
+    complete: bool = True
+) -> Dict:
     """
     Add today's data to history, replacing if date already exists.
 
     Args:
         history: Existing history dict
-        date: Date string in YYYY-MM-DD format
+        day: Date string in YYYY-MM-DD format
         total_files: Total file count
         total_folders: Total folder count
+        complete: False if some folders could not be scanned, so a same-day
+            retry scans again instead of being skipped
 
     Returns:
         Updated history dict
     """
-    # Remove existing entry for this date if present
-    history['data'] = [
-        entry for entry in history.get('data', [])
-        if entry.get('date') != date
-    ]
-
-    # Add new entry
-    history['data'].append({
-        'date': date,
+    # Key entries by date so today's entry replaces any earlier one
+    by_date = {entry.get('date', ''): entry for entry in history.get('data', [])}
+    by_date[day] = {
+        'date': day,
         'total_files': total_files,
-        'total_folders': total_folders
-    })
+        'total_folders': total_folders,
+        'complete': complete
+    }
 
-    # Sort by date
-    history['data'].sort(key=lambda x: x['date'])
+    # Stored as a list sorted by date
+    history['data'] = [by_date[d] for d in sorted(by_date)]
 
     return history
 
 
+@lru_cache(maxsize=8)
+def _cutoff_date(today_ordinal: int, days: int) -> str:
+    """Return the ISO date string `days` days before the given proleptic ordinal."""
+    return date.fromordinal(today_ordinal - days).isoformat()
+
+
 def trim_history(history: Dict, days: int = 14) -> Dict:
     """
     Keep only the last N days of history.
@@ -103,7 +95,9 @@ def trim_history(history: Dict, days: int = 14) -> Dict:
     Returns:
         Trimmed history dict
     """
-    cutoff_date = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d')
+    # ISO dates compare correctly as strings
+    today = datetime.now(timezone.utc).date()
+    cutoff_date = _cutoff_date(today.toordinal(), days)
 
     history['data'] = [
         entry for entry in history.get('data', [])
@@ -113,52 +107,18 @@ def trim_history(history: Dict, days: int = 14) -> Dict:
     return history
 
 
-def save_history_to_github(
-    token: str,
-    owner: str,
-    repo: str,
-    history: Dict,
-    branch: str = "master"
-) -> None:
+def serialize_history(history: Dict) -> bytes:
     """
-    Save history.json to GitHub repository.
+    Serialize history to the bytes stored in history.json.
 
     Args:
-        token: GitHub Personal Access Token
-        owner: Repository owner
-        repo: Repository name
-        history: History dict to save
-        branch: Branch to upload to
-    """
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents/{HISTORY_FILENAME}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-
-    # Pretty-print JSON for readability
-    content = json.dumps(history, indent=2)
-    content_b64 = base64.b64encode(content.encode('utf-8')).decode('utf-8')
-
-    # Check if file exists (need SHA for update)
-    r = get_github_session().get(url, headers=headers, timeout=TIMEOUT)
-    existing_sha = r.json().get('sha') if r.status_code == 200 else None
-
-    data = {
-        "message": "Update history data",
-        "content": content_b64,
-        "branch": branch
-    }
-
-    if existing_sha:
-        data["sha"] = existing_sha
-
-    response = get_github_session().put(url, headers=headers, json=data, timeout=TIMEOUT)
-
-    if response.status_code not in [200, 201]:
-        raise Exception(f"GitHub API error saving history: {response.status_code} - {response.text}")
+        history: History dict
 
-    print(f"History saved to GitHub ({len(history.get('data', []))} entries)")
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    # Compact JSON; the file is only read by this tool
+    return _fastjson.dumps(history)
 
 
 def get_change_from_yesterday(history: Dict) -> Optional[int]:
@@ -180,3 +140,21 @@ def get_change_from_yesterday(history: Dict) -> Optional[int]:
     yesterday_files = data[-2].get('total_files', 0)
 
     return today_files - yesterday_files
+
+
+def get_completed_entry(history: Dict, day: str) -> Optional[Dict]:
+    """
+    Return the entry for a day if a full run already recorded it.
+
+    Args:
+        history: History dict
+        day: Date string in YYYY-MM-DD format
+
+    Returns:
+        The entry marked complete for that day, or None
+    """
+    data = history.get('data', [])
+    # Data is sorted by date, so a same-day entry can only be the last one
+    if data and data[-1].get('date') == day and data[-1].get('complete'):
+        return data[-1]
+    return None
@@ -1,28 +1,108 @@
 """Cloud Function entry point for Dropbox Folder Counter."""
 
 import os
+import sys
 import json
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
 import functions_framework
 from flask import Request
 
+import _fastjson
 from dropbox_scanner import scan_dropbox_folder
-from html_generator import generate_html_report
-from github_uploader import upload_html_to_github, check_pages_enabled, enable_pages
+from html_generator import (
+    DATA_FILENAME,
+    TIMESTAMP_FORMAT,
+    generate_html_report,
+    render_change_indicator
+)
+from github_uploader import (
+    REPORT_FILENAME,
+    commit_files,
+    get_pages_url,
+    ensure_pages_enabled
+)
 from history_manager import (
+    HISTORY_FILENAME,
     fetch_history_from_github,
     append_to_history,
+    get_completed_entry,
     trim_history,
-    save_history_to_github
+    serialize_history
 )
 
 
-def get_env_var(name: str, required: bool = True) -> str:
-    """Get environment variable with optional requirement check."""
-    value = os.environ.get(name, '')
-    if required and not value:
-        raise ValueError(f"Missing required environment variable: {name}")
-    return value
+_REQUIRED = ('DROPBOX_ACCESS_TOKEN', 'GITHUB_TOKEN', 'GITHUB_OWNER', 'GITHUB_REPO')
+_OPTIONAL = (
+    'DROPBOX_REFRESH_TOKEN',
+    'DROPBOX_APP_KEY',
+    'DROPBOX_APP_SECRET',
+    'DROPBOX_ROOT_PATH',
+    'DROPBOX_CURSOR_CACHE',
+    'FORCE_SCAN'
+)
+
+
+@dataclass(frozen=True)
+class Config:
+    """Environment configuration; each field is the lowercased variable name."""
+    dropbox_access_token: str
+    github_token: str
+    github_owner: str
+    github_repo: str
+    dropbox_refresh_token: Optional[str] = None
+    dropbox_app_key: Optional[str] = None
+    dropbox_app_secret: Optional[str] = None
+    dropbox_root_path: str = ''
+    dropbox_cursor_cache: Optional[str] = None
+    force_scan: bool = False
+
+
+def load_config() -> Config:
+    """
+    Read configuration from the environment in one pass.
+
+    Returns:
+        Config; unset or empty optional variables keep the field defaults
+
+    Raises:
+        ValueError: Listing every required variable that is missing or empty
+    """
+    env = os.environ
+    missing = [name for name in _REQUIRED if not env.get(name)]
+    if missing:
+        raise ValueError(f"Missing required environment variable(s): {', '.join(missing)}")
+    values = {name.lower(): env[name] for name in _REQUIRED + _OPTIONAL if env.get(name)}
+    if 'force_scan' in values:
+        values['force_scan'] = values['force_scan'].lower() in ('1', 'true', 'yes')
+    return Config(**values)
+
+
+def build_chart_context(history: Dict) -> Optional[Dict[str, str]]:
+    """
+    Build the trend chart inputs for the HTML report from history.
+
+    Args:
+        history: History dict with 'data' list
+
+    Returns:
+        Dict with 'chart_labels_json', 'chart_values_json' and 'change_html',
+        or None if there is no history yet
+    """
+    data = history.get('data')
+    if not data:
+        return None
+
+    dates = [entry.get('date', '') for entry in data]
+    totals = [entry.get('total_files', 0) for entry in data]
+    change = totals[-1] - totals[-2] if len(totals) >= 2 else None
+    return {
+        'chart_labels_json': _fastjson.dumps(dates).decode('utf-8'),
+        'chart_values_json': _fastjson.dumps(totals).decode('utf-8'),
+        'change_html': render_change_indicator(change)
+    }
 
 
 @functions_framework.http
@@ -32,38 +112,62 @@ def main(request: Request):
 
     Orchestrates:
     1. Fetching history from GitHub
-    2. Scanning Dropbox folder for file counts
+    2. Scanning Dropbox folder for file counts, unless today's run already completed
+       (the Pages check runs in the background during the scan)
     3. Updating history with today's data
     4. Generating HTML report with trend chart
-    5. Uploading to GitHub Pages
+    5. Committing report, table data and history to GitHub Pages
 
     Returns:
         JSON response with status and details
     """
     try:
         # Load configuration from environment
-        dropbox_token = get_env_var('DROPBOX_ACCESS_TOKEN')
-        dropbox_refresh_token = get_env_var('DROPBOX_REFRESH_TOKEN', required=False) or None
-        dropbox_app_key = get_env_var('DROPBOX_APP_KEY', required=False) or None
-        dropbox_app_secret = get_env_var('DROPBOX_APP_SECRET', required=False) or None
-        dropbox_root = get_env_var('DROPBOX_ROOT_PATH', required=False) or ''
-        github_token = get_env_var('GITHUB_TOKEN')
-        github_owner = get_env_var('GITHUB_OWNER')
-        github_repo = get_env_var('GITHUB_REPO')
+        config = load_config()
+
+        now = time.gmtime()
+        today = time.strftime('%Y-%m-%d', now)
 
         # Step 1: Fetch existing history
         print("Fetching history from GitHub...")
-        history = fetch_history_from_github(github_token, github_owner, github_repo)
+        history = fetch_history_from_github(config.github_token, config.github_owner, config.github_repo)
         print(f"Loaded {len(history.get('data', []))} history entries")
 
+        # Today's report is committed together with its history entry, so a
+        # complete entry means a retry has nothing new to publish
+        completed = None if config.force_scan else get_completed_entry(history, today)
+        if completed:
+            print(f"Report for {today} is already complete, skipping scan (set FORCE_SCAN=1 to rerun)")
+            return json.dumps({
+                'status': 'skipped',
+                'total_files': completed.get('total_files', 0),
+                'history_entries': len(history.get('data', [])),
+                'filename': REPORT_FILENAME,
+                'pages_url': get_pages_url(config.github_owner, config.github_repo, REPORT_FILENAME)
+            }), 200, {'Content-Type': 'application/json'}
+
+        # The Pages check is the only step independent of the scan, so it runs
+        # in the background while Dropbox is scanned. A skipped run has nothing
+        # new to publish, and the run that completed today already checked Pages.
+        executor = ThreadPoolExecutor(max_workers=1)
+        pages_future = executor.submit(
+            ensure_pages_enabled,
+            config.github_token,
+            config.github_owner,
+            config.github_repo,
+            confirmed=history.get('pages')
+        )
+        executor.shutdown(wait=False)
+
         # Step 2: Scan Dropbox
-        print(f"Scanning Dropbox folder: {dropbox_root or '/'}")
+        print(f"Scanning Dropbox folder: {config.dropbox_root_path or '/'}")
         folder_data = scan_dropbox_folder(
-            dropbox_token,
-            dropbox_root,
-            refresh_token=dropbox_refresh_token,
-            app_key=dropbox_app_key,
-            app_secret=dropbox_app_secret
+            config.dropbox_access_token,
+            config.dropbox_root_path,
+            refresh_token=config.dropbox_refresh_token,
+            app_key=config.dropbox_app_key,
+            app_secret=config.dropbox_app_secret,
+            cursor_cache=config.dropbox_cursor_cache
         )
         print(f"Found {len(folder_data)} folders")
 
@@ -71,36 +175,49 @@ def main(request: Request):
         total_files = sum(f['file_count'] for f in folder_data if f['file_count'] >= 0)
         total_folders = len(folder_data)
 
-        # Step 3: Update history with today's data
-        today = datetime.utcnow().strftime('%Y-%m-%d')
-        history = append_to_history(history, today, total_files, total_folders)
+        # Step 3: Update history with today's data; folders that failed to scan
+        # leave the day incomplete so a retry rescans instead of skipping
+        complete = all(f['file_count'] >= 0 for f in folder_data)
+        if not complete:
+            print("Some folders could not be scanned; today's entry stays incomplete")
+        history = append_to_history(history, today, total_files, total_folders, complete=complete)
         history = trim_history(history, days=14)
         print(f"History now has {len(history.get('data', []))} entries")
 
         # Step 4: Generate HTML report with history for chart
         print("Generating HTML report with trend chart")
-        html_content = generate_html_report(folder_data, dropbox_root, history)
-        print(f"Generated HTML report ({len(html_content)} bytes)")
-
-        # Step 5: Upload both files to GitHub
-        print(f"Uploading to GitHub: {github_owner}/{github_repo}")
-
-        # Upload HTML
-        filename, pages_url = upload_html_to_github(
-            github_token,
-            github_owner,
-            github_repo,
-            html_content
+        html_content, table_data = generate_html_report(
+            folder_data,
+            config.dropbox_root_path,
+            build_chart_context(history),
+            total_files=total_files,
+            total_folders=total_folders,
+            timestamp=time.strftime(TIMESTAMP_FORMAT, now)
         )
-        print(f"Uploaded file: {filename}")
+        print(f"Generated HTML report ({len(html_content)} bytes, {len(table_data)} bytes of table data)")
 
-        # Upload history
-        save_history_to_github(github_token, github_owner, github_repo, history)
+        # Keep the confirmed Pages target with history so the next run can skip the check
+        pages = pages_future.result()
+        if pages:
+            history['pages'] = pages
+        else:
+            history.pop('pages', None)
 
-        # Check/enable GitHub Pages
-        if not check_pages_enabled(github_token, github_owner, github_repo):
-            print("Enabling GitHub Pages...")
-            enable_pages(github_token, github_owner, github_repo)
+        # Step 5: Commit report, table data and history to GitHub together
+        print(f"Uploading to GitHub: {config.github_owner}/{config.github_repo}")
+        commit_sha = commit_files(
+            config.github_token,
+            config.github_owner,
+            config.github_repo,
+            {
+                REPORT_FILENAME: html_content,
+                DATA_FILENAME: table_data,
+                HISTORY_FILENAME: serialize_history(history)
+            }
+        )
+        filename = REPORT_FILENAME
+        pages_url = get_pages_url(config.github_owner, config.github_repo, filename)
+        print(f"Committed {REPORT_FILENAME}, {DATA_FILENAME} and {HISTORY_FILENAME} ({commit_sha[:7]})")
 
         # Return success response
         return json.dumps({
@@ -143,3 +260,4 @@ if __name__ == '__main__':
     result, status_code, headers = main(MockRequest())
     print(f"Status: {status_code}")
     print(f"Response: {result}")
+    sys.exit(0 if status_code == 200 else 1)
@@ -2,21 +2,21 @@ import { test, expect } from '@playwright/test';
 
 test.describe('Chart Rendering', () => {
   test('chart canvas is present and visible with history data', async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
 
     const canvas = page.locator('#progressChart');
     await expect(canvas).toBeVisible();
   });
 
   test('chart container is visible', async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
 
     const chartContainer = page.locator('.chart-container');
     await expect(chartContainer).toBeVisible();
   });
 
   test('chart title displays "14-Day Progress"', async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
 
     const chartTitle = page.locator('.chart-title');
     await expect(chartTitle).toBeVisible();
@@ -24,7 +24,7 @@ test.describe('Chart Rendering', () => {
   });
 
   test('Chart.js renders on canvas (canvas has dimensions)', async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
 
     // Wait for Chart.js to render
     await page.waitForTimeout(500);
@@ -41,7 +41,7 @@ test.describe('Chart Rendering', () => {
 
 test.describe('Chart Hidden States', () => {
   test('chart container is hidden when no history data', async ({ page }) => {
-    await page.goto('/index-no-history.html');
+    await page.goto('/no-history/');
 
     // The no-history fixture doesn't have the chart container
     const chartContainer = page.locator('.chart-container');
@@ -49,14 +49,14 @@ test.describe('Chart Hidden States', () => {
   });
 
   test('chart canvas is not present when no history', async ({ page }) => {
-    await page.goto('/index-no-history.html');
+    await page.goto('/no-history/');
 
     const canvas = page.locator('#progressChart');
     await expect(canvas).toHaveCount(0);
   });
 
   test('chart is hidden in empty state', async ({ page }) => {
-    await page.goto('/index-empty.html');
+    await page.goto('/empty/');
 
     // Empty fixture also doesn't have chart
     const chartContainer = page.locator('.chart-container');
@@ -66,7 +66,7 @@ test.describe('Chart Hidden States', () => {
 
 test.describe('Chart with Different Data', () => {
   test('chart renders correctly on error page (has chart)', async ({ page }) => {
-    await page.goto('/index-error.html');
+    await page.goto('/error/');
 
     const canvas = page.locator('#progressChart');
     await expect(canvas).toBeVisible();
@@ -80,7 +80,7 @@ test.describe('Chart with Different Data', () => {
   });
 
   test('chart renders correctly on large dataset page', async ({ page }) => {
-    await page.goto('/index-large.html');
+    await page.goto('/large/');
 
     const canvas = page.locator('#progressChart');
     await expect(canvas).toBeVisible();
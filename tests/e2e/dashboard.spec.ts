@@ -2,7 +2,7 @@ import { test, expect } from '@playwright/test';
 
 test.describe('Dashboard Layout', () => {
   test.beforeEach(async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
   });
 
   test('has correct page title', async ({ page }) => {
@@ -49,33 +49,37 @@ test.describe('Dashboard Layout', () => {
 
 test.describe('Change Indicator Colors', () => {
   test('shows red color for increase (full fixture)', async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
     const changeBox = page.locator('.stat-box.change-box .value');
     await expect(changeBox).toHaveCSS('color', 'rgb(220, 53, 69)'); // #dc3545
   });
 
   test('shows green color for decrease (error fixture)', async ({ page }) => {
-    await page.goto('/index-error.html');
+    await page.goto('/error/');
     const changeBox = page.locator('.stat-box.change-box .value');
     await expect(changeBox).toHaveCSS('color', 'rgb(40, 167, 69)'); // #28a745
   });
 
-  test('shows neutral color for no change (empty fixture)', async ({ page }) => {
-    await page.goto('/index-empty.html');
+  test('shows neutral color for no change (large fixture)', async ({ page }) => {
+    await page.goto('/large/');
     const changeBox = page.locator('.stat-box.change-box .value');
     await expect(changeBox).toHaveCSS('color', 'rgb(102, 102, 102)'); // #666
   });
 
-  test('shows neutral color for no change (no-history fixture)', async ({ page }) => {
-    await page.goto('/index-no-history.html');
-    const changeBox = page.locator('.stat-box.change-box .value');
-    await expect(changeBox).toHaveCSS('color', 'rgb(102, 102, 102)'); // #666
+  test('is omitted without history (empty fixture)', async ({ page }) => {
+    await page.goto('/empty/');
+    await expect(page.locator('.stat-box.change-box')).toHaveCount(0);
+  });
+
+  test('is omitted without history (no-history fixture)', async ({ page }) => {
+    await page.goto('/no-history/');
+    await expect(page.locator('.stat-box.change-box')).toHaveCount(0);
   });
 });
 
 test.describe('Empty State', () => {
   test.beforeEach(async ({ page }) => {
-    await page.goto('/index-empty.html');
+    await page.goto('/empty/');
   });
 
   test('shows zero totals', async ({ page }) => {
@@ -0,0 +1,81 @@
+"""Regenerate the e2e fixtures from the real report generator.
+
+Each scenario is written to fixtures/<name>/ as the index.html produced by
+generate_html_report plus the report_data.json it loads, so the Playwright
+suite exercises exactly what the daily run publishes. Run from the repo root:
+
+    python tests/e2e/generate_fixtures.py
+"""
+
+import random
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from html_generator import DATA_FILENAME, generate_html_report  # noqa: E402
+from main import build_chart_context  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+ROOT_PATH = '/Reports'
+TIMESTAMP = '2026-01-29 02:52:13 UTC'
+DATES = ['2026-01-26', '2026-01-27', '2026-01-28', '2026-01-29']
+
+BATCH_COUNTS = {
+    'batch 357': 1888, 'batch 358': 2296, 'batch 359': 1742, 'batch 360': 356,
+    'batch 361': 1568, 'batch 362': 2027, 'batch 363': 3563, 'batch 364': 1390,
+    'batch 365': 1130, 'batch 366': 1703, 'batch 367': 2603, 'batch 368': 3425,
+    'batch 369': 1577, 'batch 370': 3048, 'batch 372': 1653, 'batch 373': 2117,
+    'batch 374': 1618, "Tom's": 110, 'Tom&Jerry': 897, 'batch 377': 1607,
+}
+
+
+def _folders(counts, include_root=True):
+    """Scan results as dropbox_scanner returns them, under ROOT_PATH."""
+    folders = [{'path': ROOT_PATH, 'file_count': 0}] if include_root else []
+    folders += [{'path': f"{ROOT_PATH}/{name}", 'file_count': count} for name, count in counts.items()]
+    return folders
+
+
+def _history(totals):
+    return {'data': [{'date': d, 'total_files': t} for d, t in zip(DATES, totals)]}
+
+
+def _scenarios():
+    full = _folders(BATCH_COUNTS)
+
+    errors = _folders({'batch 357': 500, 'batch 358': 500, 'batch 359': 500, 'error-folder': -1})
+
+    rng = random.Random(42)
+    large_counts = {f"folder-{i:03d}": rng.randint(100, 5000) for i in range(1, 351)}
+    large = _folders(large_counts, include_root=False)
+    large_total = sum(large_counts.values())
+
+    return {
+        'full': (full, _history([36318, 36318, 0, 36318])),
+        'error': (errors, _history([2000, 2000, 2000, 1500])),
+        # Flat last two days, for the neutral change indicator
+        'large': (large, _history([840000, 845000, large_total, large_total])),
+        'no-history': (full, {'data': []}),
+        'empty': ([], {'data': []}),
+    }
+
+
+def main():
+    for name, (folders, history) in _scenarios().items():
+        html_content, table_data = generate_html_report(
+            folders,
+            ROOT_PATH,
+            build_chart_context(history),
+            timestamp=TIMESTAMP
+        )
+        out_dir = FIXTURES_DIR / name
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / 'index.html').write_bytes(html_content)
+        (out_dir / DATA_FILENAME).write_bytes(table_data)
+        print(f"Wrote {out_dir.relative_to(REPO_ROOT)}")
+
+
+if __name__ == '__main__':
+    main()
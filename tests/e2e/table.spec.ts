@@ -2,7 +2,7 @@ import { test, expect } from '@playwright/test';
 
 test.describe('Table Rendering', () => {
   test.beforeEach(async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
     // Wait for Tabulator to initialize
     await page.waitForSelector('.tabulator-row');
   });
@@ -33,7 +33,7 @@ test.describe('Table Rendering', () => {
 
 test.describe('Table Sorting', () => {
   test.beforeEach(async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
     await page.waitForSelector('.tabulator-row');
   });
 
@@ -70,11 +70,25 @@ test.describe('Table Sorting', () => {
     const pathCell = firstRow.locator('.tabulator-cell').first();
     await expect(pathCell).toContainText('/');
   });
+
+  test('path header sort matches the initial order', async ({ page }) => {
+    // "/Tom&Jerry" sorts before "/Tom's" by the raw path, but after it by the
+    // escaped text ("&amp;" vs "&#x27;") or by locale collation
+    const pathCells = page.locator('.tabulator-row .tabulator-cell:first-child');
+    const initialOrder = await pathCells.allTextContents();
+    expect(initialOrder.indexOf('/Tom&Jerry')).toBeLessThan(initialOrder.indexOf("/Tom's"));
+
+    const pathHeader = page.locator('.tabulator-col').filter({ hasText: 'Folder Path' });
+    await pathHeader.click();
+    await page.waitForTimeout(300);
+
+    expect(await pathCells.allTextContents()).toEqual(initialOrder);
+  });
 });
 
 test.describe('Table Search', () => {
   test.beforeEach(async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
     await page.waitForSelector('.tabulator-row');
   });
 
@@ -113,6 +127,28 @@ test.describe('Table Search', () => {
     expect(count).toBeGreaterThan(0);
   });
 
+  test('search matches special characters in folder names', async ({ page }) => {
+    const searchInput = page.locator('#search-input');
+
+    await searchInput.fill('&');
+    await page.waitForTimeout(300);
+
+    const rows = page.locator('.tabulator-row');
+    await expect(rows).toHaveCount(1);
+    await expect(rows.first()).toContainText('/Tom&Jerry');
+  });
+
+  test('search does not match HTML entity text', async ({ page }) => {
+    const searchInput = page.locator('#search-input');
+
+    // "/Tom&Jerry" and "/Tom's" are escaped as &amp; and &#x27; in path_html
+    for (const term of ['amp', 'x27', '#']) {
+      await searchInput.fill(term);
+      await page.waitForTimeout(300);
+      await expect(page.locator('.tabulator-row')).toHaveCount(0);
+    }
+  });
+
   test('clearing search shows all rows again', async ({ page }) => {
     const searchInput = page.locator('#search-input');
     const initialRowCount = await page.locator('.tabulator-row').count();
@@ -130,7 +166,7 @@ test.describe('Table Search', () => {
 
 test.describe('Table Pagination', () => {
   test('pagination controls are visible on large dataset', async ({ page }) => {
-    await page.goto('/index-large.html');
+    await page.goto('/large/');
     await page.waitForSelector('.tabulator-row');
 
     // Tabulator pagination controls
@@ -139,7 +175,7 @@ test.describe('Table Pagination', () => {
   });
 
   test('page size selector has correct options', async ({ page }) => {
-    await page.goto('/index-large.html');
+    await page.goto('/large/');
     await page.waitForSelector('.tabulator-row');
 
     // Check page size selector exists
@@ -157,7 +193,7 @@ test.describe('Table Pagination', () => {
   });
 
   test('changing page size affects displayed rows', async ({ page }) => {
-    await page.goto('/index-large.html');
+    await page.goto('/large/');
     await page.waitForSelector('.tabulator-row');
 
     // Default is 50, change to 25
@@ -171,7 +207,7 @@ test.describe('Table Pagination', () => {
   });
 
   test('pagination navigation works', async ({ page }) => {
-    await page.goto('/index-large.html');
+    await page.goto('/large/');
     await page.waitForSelector('.tabulator-row');
 
     // Get first row content on page 1
@@ -192,7 +228,7 @@ test.describe('Table Pagination', () => {
 
 test.describe('Row Styling', () => {
   test('row hover changes background color', async ({ page }) => {
-    await page.goto('/index-full.html');
+    await page.goto('/full/');
     await page.waitForSelector('.tabulator-row');
 
     const row = page.locator('.tabulator-row').first();
@@ -207,7 +243,7 @@ test.describe('Row Styling', () => {
 
 test.describe('Error Entries', () => {
   test('error entries show red "Error" text', async ({ page }) => {
-    await page.goto('/index-error.html');
+    await page.goto('/error/');
     await page.waitForSelector('.tabulator-row');
 
     // Find the error cell - it's a span with exact text "Error" and red color
@@ -0,0 +1,116 @@
+"""Tests for the recursive and cursor-cached scans in dropbox_scanner."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import dropbox
+from dropbox.files import DeletedMetadata, FileMetadata, FolderMetadata
+
+import dropbox_scanner
+
+
+def _page(entries, cursor='cursor-1'):
+    return SimpleNamespace(entries=entries, cursor=cursor, has_more=False)
+
+
+def _folder(path):
+    return FolderMetadata(name=path.rsplit('/', 1)[-1], path_lower=path.lower())
+
+
+def _file(path):
+    return FileMetadata(name=path.rsplit('/', 1)[-1], path_lower=path.lower())
+
+
+def _deleted(path):
+    return DeletedMetadata(name=path.rsplit('/', 1)[-1], path_lower=path.lower())
+
+
+TREE = [
+    _folder('/Reports'),
+    _file('/Reports/summary.txt'),
+    _folder('/Reports/a'),
+    _file('/Reports/a/1.txt'),
+    _file('/Reports/a/2.txt'),
+    _folder('/Reports/a/deep'),
+    _file('/Reports/a/deep/3.txt'),
+    _folder('/Reports/b'),
+]
+
+
+class ScanDropboxFolderTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = Path(tmp.name) / 'cursor.json'
+        self.dbx = mock.Mock()
+        self.dbx.files_list_folder.return_value = _page(TREE)
+        patcher = mock.patch.object(dropbox_scanner, '_get_client', return_value=self.dbx)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def scan(self, cursor_cache=None):
+        results = dropbox_scanner.scan_dropbox_folder('token', '/Reports', cursor_cache=cursor_cache)
+        return {r['path']: r['file_count'] for r in results}
+
+    def test_full_scan_counts_direct_files(self):
+        counts = self.scan()
+
+        self.assertEqual(counts, {
+            '/Reports': 1,
+            '/reports/a': 2,
+            '/reports/a/deep': 1,
+            '/reports/b': 0,
+        })
+        self.dbx.files_list_folder.assert_called_once_with('/Reports', recursive=True, limit=2000)
+        self.assertFalse(self.cache.exists())
+
+    def test_cursor_delta_adds_and_deletes_files(self):
+        self.scan(str(self.cache))
+        self.dbx.files_list_folder_continue.return_value = _page([
+            _file('/Reports/b/new.txt'),
+            _deleted('/Reports/a/1.txt'),
+        ], cursor='cursor-2')
+
+        counts = self.scan(str(self.cache))
+
+        self.dbx.files_list_folder.assert_called_once()
+        self.dbx.files_list_folder_continue.assert_called_once_with('cursor-1')
+        self.assertEqual(counts['/reports/a'], 1)
+        self.assertEqual(counts['/reports/b'], 1)
+        saved = json.loads(self.cache.read_text(encoding='utf-8'))
+        self.assertEqual(saved['/reports']['cursor'], 'cursor-2')
+
+    def test_deleted_folder_drops_its_subtree(self):
+        self.scan(str(self.cache))
+        self.dbx.files_list_folder_continue.return_value = _page([
+            _deleted('/Reports/a'),
+            _folder('/Reports/a'),
+            _file('/Reports/a/fresh.txt'),
+            _deleted('/Reports/b'),
+        ])
+
+        counts = self.scan(str(self.cache))
+
+        self.assertEqual(counts, {
+            '/Reports': 1,
+            '/reports/a': 1,
+        })
+
+    def test_rejected_cursor_falls_back_to_full_scan(self):
+        self.scan(str(self.cache))
+        self.dbx.files_list_folder_continue.side_effect = dropbox.exceptions.ApiError(
+            'request-id', 'reset', None, None
+        )
+
+        counts = self.scan(str(self.cache))
+
+        self.assertEqual(self.dbx.files_list_folder.call_count, 2)
+        self.assertEqual(counts['/reports/a'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
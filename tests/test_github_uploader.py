@@ -0,0 +1,60 @@
+"""Tests for the recorded GitHub Pages status in github_uploader."""
+
+import unittest
+from unittest import mock
+
+import github_uploader
+
+TARGET = 'owner/repo@master'
+
+
+@mock.patch.object(github_uploader, 'enable_pages', return_value=True)
+@mock.patch.object(github_uploader, 'check_pages_enabled', return_value=True)
+@mock.patch.object(github_uploader, '_pages_site_found', return_value=True)
+class EnsurePagesEnabledTest(unittest.TestCase):
+    def test_matching_record_skips_api_check(self, site_found, check, enable):
+        record = github_uploader.ensure_pages_enabled('token', 'owner', 'repo', confirmed=TARGET)
+
+        self.assertEqual(record, TARGET)
+        site_found.assert_called_once_with('owner', 'repo')
+        check.assert_not_called()
+        enable.assert_not_called()
+
+    def test_matching_record_with_pages_disabled_enables_again(self, site_found, check, enable):
+        site_found.return_value = False
+        check.return_value = False
+
+        record = github_uploader.ensure_pages_enabled('token', 'owner', 'repo', confirmed=TARGET)
+
+        self.assertEqual(record, TARGET)
+        check.assert_called_once_with('token', 'owner', 'repo')
+        enable.assert_called_once_with('token', 'owner', 'repo', 'master')
+
+    def test_matching_record_with_failed_enable_is_dropped(self, site_found, check, enable):
+        site_found.return_value = False
+        check.return_value = False
+        enable.return_value = False
+
+        record = github_uploader.ensure_pages_enabled('token', 'owner', 'repo', confirmed=TARGET)
+
+        self.assertIsNone(record)
+
+    def test_other_target_is_checked(self, site_found, check, enable):
+        record = github_uploader.ensure_pages_enabled(
+            'token', 'owner', 'repo', confirmed='owner/repo@gh-pages'
+        )
+
+        self.assertEqual(record, TARGET)
+        site_found.assert_not_called()
+        check.assert_called_once_with('token', 'owner', 'repo')
+        enable.assert_not_called()
+
+    def test_no_record_is_checked(self, site_found, check, enable):
+        record = github_uploader.ensure_pages_enabled('token', 'owner', 'repo')
+
+        self.assertEqual(record, TARGET)
+        check.assert_called_once_with('token', 'owner', 'repo')
+
+
+if __name__ == '__main__':
+    unittest.main()